@@ -10,8 +10,14 @@ Usage:
 from __future__ import annotations
 
 import argparse
+import os
+import re
 from datetime import datetime
 from pathlib import Path
+from string import Template
+
+
+MODULE_RE = re.compile(r"(?:^|/)m[0-8]/|module|build_plan|microsteps|v_01")
 
 
 def stamp() -> str:
@@ -22,6 +28,27 @@ def rel(from_dir: Path, target: Path) -> str:
     return target.relative_to(from_dir).as_posix()
 
 
+def scan_build_plan(bp: Path) -> list[Path]:
+    """
+    Single walk of bp collecting every .html file.
+    """
+    html_paths: list[Path] = []
+    stack = [str(bp)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for e in it:
+                    if e.is_dir(follow_symlinks=False):
+                        stack.append(e.path)
+                    # normcase keeps rglob's matching: case-insensitive on Windows only
+                    elif os.path.normcase(e.name).endswith(".html"):
+                        html_paths.append(Path(e.path))
+        except PermissionError:
+            # rglob silently skipped unreadable directories
+            continue
+    return html_paths
+
+
 def pick_master(bp: Path) -> Path | None:
     preferred = [
         bp / "MASTER_BUILD_PLAN_CONSOLIDATED_V2.html",
@@ -35,7 +62,7 @@ def pick_master(bp: Path) -> Path | None:
     return hits[0] if hits else None
 
 
-def pick_microsteps(bp: Path) -> Path | None:
+def pick_microsteps(bp: Path, html_paths: list[Path]) -> Path | None:
     candidates = [
         bp / "microsteps_full" / "index.html",
         bp / "m0_m8_microsteps" / "index.html",
@@ -47,12 +74,12 @@ def pick_microsteps(bp: Path) -> Path | None:
             return c
 
     hits = sorted(
-        [p for p in bp.rglob("*.html") if p.name.lower().startswith("index") and "micro" in str(p).lower()]
+        [p for p in html_paths if p.name.lower().startswith("index") and "micro" in str(p).lower()]
     )
     return hits[0] if hits else None
 
 
-def discover_module_pages(bp: Path, max_items: int = 80) -> list[tuple[str, str]]:
+def discover_module_pages(bp: Path, html_paths: list[Path], max_items: int = 80) -> list[tuple[str, str]]:
     items: list[tuple[str, str]] = []
     seen: set[str] = set()
 
@@ -63,21 +90,18 @@ def discover_module_pages(bp: Path, max_items: int = 80) -> list[tuple[str, str]
         seen.add(rp)
         items.append((rp, rp))
 
-    for p in sorted(bp.rglob("*.html")):
+    for p in sorted(html_paths):
         rp = p.relative_to(bp).as_posix()
         low = rp.lower()
         if low == "index.html":
             continue
 
-        is_moduleish = any(f"/m{i}/" in low or low.startswith(f"m{i}/") for i in range(0, 9))
-        is_moduleish = is_moduleish or any(k in low for k in ["v_01", "module", "build_plan", "microsteps"])
-
-        if is_moduleish and ("overview" in low or p.name.lower().startswith("index")):
+        if MODULE_RE.search(low) and ("overview" in low or p.name.lower().startswith("index")):
             add(p)
 
     if not items:
-        for p in sorted(bp.glob("*.html")):
-            if p.name.lower() != "index.html":
+        for p in sorted(html_paths):
+            if p.parent == bp and p.name.lower() != "index.html":
                 add(p)
 
     return items[:max_items]
@@ -90,40 +114,40 @@ HTML = """<!doctype html>
 <meta name="viewport" content="width=device-width,initial-scale=1"/>
 <title>Writers Dashboard — North Star</title>
 <style>
-:root{{--bg:#0b0f14;--panel:#111826;--text:#e6edf3;--muted:#9fb0c0;--accent:#6aa9ff;--border:rgba(255,255,255,.08)}}
-*{{box-sizing:border-box}}
-body{{margin:0;font-family:ui-sans-serif,system-ui,-apple-system,Segoe UI,Roboto,Arial;background:var(--bg);color:var(--text)}}
-.wrap{{display:flex;min-height:100vh}}
-nav{{width:340px;max-width:90vw;background:var(--panel);border-right:1px solid var(--border);padding:18px;position:sticky;top:0;height:100vh;overflow:auto}}
-main{{flex:1;padding:28px;max-width:1100px}}
-h1{{margin:0 0 10px;font-size:28px}}
-h2{{margin:22px 0 10px;font-size:18px}}
-p{{color:var(--muted);line-height:1.45}}
-a{{color:var(--accent);text-decoration:none}}
-a:hover{{text-decoration:underline}}
-.card{{border:1px solid var(--border);border-radius:14px;padding:14px;background:rgba(255,255,255,.02);margin:10px 0}}
-.small{{font-size:13px;color:var(--muted)}}
-ul{{margin:8px 0 0 18px;color:var(--muted)}}
-code{{background:rgba(255,255,255,.06);padding:2px 6px;border-radius:8px}}
-hr{{border:0;border-top:1px solid var(--border);margin:18px 0}}
+:root{--bg:#0b0f14;--panel:#111826;--text:#e6edf3;--muted:#9fb0c0;--accent:#6aa9ff;--border:rgba(255,255,255,.08)}
+*{box-sizing:border-box}
+body{margin:0;font-family:ui-sans-serif,system-ui,-apple-system,Segoe UI,Roboto,Arial;background:var(--bg);color:var(--text)}
+.wrap{display:flex;min-height:100vh}
+nav{width:340px;max-width:90vw;background:var(--panel);border-right:1px solid var(--border);padding:18px;position:sticky;top:0;height:100vh;overflow:auto}
+main{flex:1;padding:28px;max-width:1100px}
+h1{margin:0 0 10px;font-size:28px}
+h2{margin:22px 0 10px;font-size:18px}
+p{color:var(--muted);line-height:1.45}
+a{color:var(--accent);text-decoration:none}
+a:hover{text-decoration:underline}
+.card{border:1px solid var(--border);border-radius:14px;padding:14px;background:rgba(255,255,255,.02);margin:10px 0}
+.small{font-size:13px;color:var(--muted)}
+ul{margin:8px 0 0 18px;color:var(--muted)}
+code{background:rgba(255,255,255,.06);padding:2px 6px;border-radius:8px}
+hr{border:0;border-top:1px solid var(--border);margin:18px 0}
 </style>
 </head>
 <body>
 <div class="wrap">
 <nav>
   <h2>North Star</h2>
-  <div class="small">Updated: {updated}</div>
+  <div class="small">Updated: $updated</div>
   <hr/>
   <div class="card">
     <div><strong>Primary Entry Points</strong></div>
     <ul>
-      {primary_links}
+      $primary_links
     </ul>
   </div>
   <div class="card">
     <div><strong>Module Pages</strong></div>
     <ul>
-      {module_links}
+      $module_links
     </ul>
   </div>
   <div class="card">
@@ -160,6 +184,7 @@ hr{{border:0;border-top:1px solid var(--border);margin:18px 0}}
 </body>
 </html>
 """
+_TPL = Template(HTML)
 
 
 def main() -> None:
@@ -172,8 +197,10 @@ def main() -> None:
     bp = (repo / args.build_plan).resolve()
     bp.mkdir(parents=True, exist_ok=True)
 
+    html_paths = scan_build_plan(bp)
+
     master = pick_master(bp)
-    micro = pick_microsteps(bp)
+    micro = pick_microsteps(bp, html_paths)
 
     primary_items: list[tuple[str, str]] = []
     if master:
@@ -184,7 +211,7 @@ def main() -> None:
         primary_items.append(("Master Reader (not found)", "#"))
         primary_items.append(("Microsteps (not found)", "#"))
 
-    module_items = discover_module_pages(bp)
+    module_items = discover_module_pages(bp, html_paths)
 
     primary_links = "\n      ".join(
         [f'<li><a href="{href}">{label}</a></li>' for label, href in primary_items]
@@ -195,7 +222,7 @@ def main() -> None:
 
     out = bp / "index.html"
     out.write_text(
-        HTML.format(
+        _TPL.substitute(
             updated=stamp(),
             primary_links=primary_links,
             module_links=module_links,
@@ -17,12 +17,13 @@ Or point at a specific root:
 from __future__ import annotations
 
 import os
+import re
 import sys
 from pathlib import Path
 from datetime import datetime
 
 # Keep these lean: we want structure, not noise.
-DEFAULT_IGNORES = {
+DEFAULT_IGNORES = frozenset({
     ".git",
     "node_modules",
     ".venv",
@@ -36,7 +37,7 @@ DEFAULT_IGNORES = {
     ".cache",
     ".idea",
     ".vscode",
-}
+})
 
 KEY_SRC_FILES = [
     "App.tsx",
@@ -47,70 +48,120 @@ KEY_SRC_FILES = [
     "main.jsx",
 ]
 
-def should_ignore(path: Path) -> bool:
-    parts = set(path.parts)
-    if parts & DEFAULT_IGNORES:
-        return True
-    # Ignore huge lock/artefact dirs if needed; keep conservative.
-    return False
+# Tree drawing tokens for write_tree.
+CONN_MID = "├── "
+CONN_LAST = "└── "
+CONT_MID = "│   "
+CONT_LAST = "    "
+
+# detect .../writers-dashboard-app/writers-dashboard-app/...
+NESTED_RE = re.compile(
+    r"(?:^|[\\/])writers-dashboard-app[\\/]writers-dashboard-app(?:[\\/]|$)", re.IGNORECASE
+)
+
+# (nested app dirs, package.json paths, top-most src folders)
+RepoScan = tuple[list[Path], list[Path], list[Path]]
+
+def should_ignore_name(name: str) -> bool:
+    # Traversals prune by name as they descend, so ancestors never need rechecking.
+    return name in DEFAULT_IGNORES
 
 def write_tree(root: Path, out_path: Path, max_files_per_dir: int = 80) -> None:
     """
     Write a tree representation. We cap files per directory to avoid megadumps.
     """
-    lines = []
     root = root.resolve()
+    # Stream into a sibling temp file (skipped by the walk) and rename it over
+    # out_path at the end, so the tree never lists its own half-written output.
+    tmp_path = out_path.with_name(out_path.name + ".tmp")
+    tmp_dir = os.path.normcase(str(tmp_path.parent.resolve()))
+    with tmp_path.open("w", encoding="utf-8", buffering=1 << 20) as fh:
+        fh.write(f"ROOT: {root}\n")
+        fh.write(f"Generated: {datetime.now().isoformat(timespec='seconds')}\n")
+        fh.write("\n")
+        # Every later line is written with a leading newline, so the file keeps
+        # its previous "\n".join() shape (no trailing newline).
+        fh.write(f"{root.name}/")
 
-    def walk(dir_path: Path, prefix: str = ""):
-        try:
-            entries = sorted(dir_path.iterdir(), key=lambda p: (p.is_file(), p.name.lower()))
-        except PermissionError:
-            lines.append(f"{prefix}[PERMISSION DENIED] {dir_path.name}/")
-            return
+        # Explicit stack instead of recursion: items are either finished output
+        # lines (str) or directories still to list (dir_path, prefix). A listed
+        # directory pushes its items in reverse so they pop in display order.
+        stack: list[str | tuple[str, str]] = [(str(root), "")]
+        while stack:
+            item = stack.pop()
+            if isinstance(item, str):
+                fh.write("\n")
+                fh.write(item)
+                continue
 
-        # Filter ignored
-        entries = [e for e in entries if not should_ignore(e)]
+            dir_path, prefix = item
+            skip_name = tmp_path.name if os.path.normcase(dir_path) == tmp_dir else None
+            try:
+                with os.scandir(dir_path) as it:
+                    # Filter ignored
+                    entries = [e for e in it if not should_ignore_name(e.name) and e.name != skip_name]
+            except PermissionError:
+                fh.write(f"\n{prefix}[PERMISSION DENIED] {os.path.basename(dir_path)}/")
+                continue
+            entries.sort(key=lambda e: (e.is_file(), e.name.lower()))
 
-        # Cap noisy dirs
-        if len(entries) > max_files_per_dir:
-            shown = entries[:max_files_per_dir]
-            omitted = len(entries) - max_files_per_dir
-        else:
-            shown = entries
-            omitted = 0
-
-        for i, entry in enumerate(shown):
-            is_last = (i == len(shown) - 1) and (omitted == 0)
-            connector = "└── " if is_last else "├── "
-            if entry.is_dir():
-                lines.append(f"{prefix}{connector}{entry.name}/")
-                walk(entry, prefix + ("    " if is_last else "│   "))
+            # Cap noisy dirs
+            if len(entries) > max_files_per_dir:
+                shown = entries[:max_files_per_dir]
+                omitted = len(entries) - max_files_per_dir
             else:
-                lines.append(f"{prefix}{connector}{entry.name}")
+                shown = entries
+                omitted = 0
 
-        if omitted > 0:
-            lines.append(f"{prefix}└── ... ({omitted} more items omitted)")
+            items: list[str | tuple[str, str]] = []
+            last_i = len(shown) - 1 if omitted == 0 else -1
+            for i, entry in enumerate(shown):
+                if i == last_i:
+                    conn, cont = CONN_LAST, CONT_LAST
+                else:
+                    conn, cont = CONN_MID, CONT_MID
+                if entry.is_dir():
+                    items.append(prefix + conn + entry.name + "/")
+                    items.append((entry.path, prefix + cont))
+                else:
+                    items.append(prefix + conn + entry.name)
 
-    lines.append(f"ROOT: {root}")
-    lines.append(f"Generated: {datetime.now().isoformat(timespec='seconds')}")
-    lines.append("")
-    lines.append(f"{root.name}/")
-    walk(root)
-    out_path.write_text("\n".join(lines), encoding="utf-8")
+            if omitted > 0:
+                items.append(f"{prefix}{CONN_LAST}... ({omitted} more items omitted)")
+            stack.extend(reversed(items))
+    os.replace(tmp_path, out_path)
 
-def find_src_folders(root: Path) -> list[Path]:
+def scan_once(root: Path) -> RepoScan:
+    """
+    Single walk feeding suspicious_patterns and find_src_folders.
+    """
+    nested: list[Path] = []
+    package_jsons: list[Path] = []
     srcs: list[Path] = []
+    in_src: set[str] = set()  # src dirs and everything below them
     for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if not should_ignore_name(d)]
         p = Path(dirpath)
-        if should_ignore(p):
-            dirnames[:] = []  # don't descend
-            continue
-        # quick ignore for node_modules already handled by should_ignore
-        if p.name == "src":
+
+        if NESTED_RE.search(dirpath):
+            nested.append(p)
+
+        if "package.json" in filenames:
+            package_jsons.append(p / "package.json")
+
+        # Only the outermost src counts, but keep descending for the other checks.
+        parent = os.path.dirname(dirpath)
+        if parent in in_src:
+            in_src.add(dirpath)
+        elif p.name == "src":
             srcs.append(p)
-            # still descend? usually not needed; skip for speed
-            dirnames[:] = []
-    return sorted(set(s.resolve() for s in srcs))
+            in_src.add(dirpath)
+    return nested, package_jsons, srcs
+
+def find_src_folders(root: Path, scan: RepoScan | None = None) -> list[Path]:
+    _, _, srcs = scan or scan_once(root)
+    # Walk paths are already absolute; normpath is enough without a realpath per folder.
+    return sorted(set(Path(os.path.normpath(s)) for s in srcs))
 
 def describe_src(src_path: Path) -> str:
     """
@@ -133,7 +184,7 @@ def describe_src(src_path: Path) -> str:
         f"  First entries: {', '.join(top_entries)}\n"
     )
 
-def suspicious_patterns(root: Path) -> list[str]:
+def suspicious_patterns(root: Path, scan: RepoScan | None = None) -> list[str]:
     """
     Flag common flip-flop / nesting issues:
     - writers-dashboard-app/writers-dashboard-app/
@@ -143,24 +194,14 @@ def suspicious_patterns(root: Path) -> list[str]:
     flags: list[str] = []
     root = root.resolve()
 
+    nested, package_jsons, _ = scan or scan_once(root)
+
     # 1) Nested folder pattern
-    for p in root.rglob("*"):
-        if should_ignore(p):
-            continue
-        if p.is_dir():
-            parts = [x.lower() for x in p.parts]
-            # detect .../writers-dashboard-app/writers-dashboard-app/...
-            for i in range(len(parts) - 1):
-                if parts[i] == "writers-dashboard-app" and parts[i + 1] == "writers-dashboard-app":
-                    flags.append(f"Nested app folder detected: {p}")
-                    break
+    for p in nested:
+        flags.append(f"Nested app folder detected: {p}")
 
     # 2) package.json locations
-    package_jsons = []
-    for pj in root.rglob("package.json"):
-        if should_ignore(pj):
-            continue
-        package_jsons.append(pj.resolve())
+    package_jsons = [Path(os.path.normpath(pj)) for pj in package_jsons]
     if len(package_jsons) > 1:
         flags.append("Multiple package.json detected (possible multiple app roots):")
         flags.extend([f"  - {p}" for p in package_jsons])
@@ -168,7 +209,7 @@ def suspicious_patterns(root: Path) -> list[str]:
         flags.append(f"Single package.json detected at: {package_jsons[0]}")
 
     # 3) src folder locations
-    srcs = find_src_folders(root)
+    srcs = find_src_folders(root, scan)
     if len(srcs) == 0:
         flags.append("No src/ folders found (unexpected for Vite app).")
     else:
@@ -198,7 +239,8 @@ def main():
 
     write_tree(root, tree_out)
 
-    srcs = find_src_folders(root)
+    scan = scan_once(root)
+    srcs = find_src_folders(root, scan)
     src_lines = [f"ROOT: {root}", f"Generated: {datetime.now().isoformat(timespec='seconds')}", ""]
     if not srcs:
         src_lines.append("No src/ folders found.")
@@ -207,7 +249,7 @@ def main():
             src_lines.append(describe_src(s))
     src_out.write_text("\n".join(src_lines), encoding="utf-8")
 
-    flags = suspicious_patterns(root)
+    flags = suspicious_patterns(root, scan)
     sus_out.write_text("\n".join(flags), encoding="utf-8")
 
     print("✅ Repo mapping complete.")
@@ -18,16 +18,22 @@ Usage:
 from __future__ import annotations
 
 import argparse
-import csv
 import os
 import re
 from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache, partial
 from pathlib import Path
-from urllib.parse import urlparse, unquote
+from urllib.parse import unquote
 
-ATTR_RE = re.compile(r"""(?P<attr>\bhref\b|\bsrc\b)\s*=\s*["'](?P<val>[^"']+)["']""", re.IGNORECASE)
-SKIP_PREFIXES = ("http://", "https://", "mailto:", "tel:", "#", "javascript:")
+# Scans raw bytes: attribute syntax is ASCII, so only matched values need decoding.
+# A bytes \b treats every non-ASCII byte as a non-word char; _repl rejects matches
+# whose preceding character is a Unicode word char (e.g. "ésrc="), as str \b did.
+ATTR_RE_B = re.compile(rb"""(?P<attr>\bhref\b|\bsrc\b)\s*=\s*["'](?P<val>[^"']+)["']""", re.IGNORECASE)
+_WORD_RE = re.compile(r"\w")
+# Anything with a URL scheme (http:, mailto:, data:, ... and disk paths like C:\...),
+# protocol-relative //host links and bare #fragments are never rewritten.
+SKIP_RE = re.compile(r"^(?:[A-Za-z][A-Za-z0-9+.-]*:|//|#)")  # applied to _clean(val)
 
 @dataclass
 class LinkIssue:
@@ -41,52 +47,240 @@ class LinkIssue:
 def stamp() -> str:
     return datetime.now().strftime("%Y%m%d_%H%M%S")
 
-def is_external(v: str) -> bool:
-    v = v.strip()
-    return any(v.lower().startswith(p) for p in SKIP_PREFIXES)
+_C0_OR_SPACE = "".join(map(chr, range(0x21)))
+
+def _clean(v: str) -> str:
+    # Same clean-up urlsplit (and browsers) apply before parsing a URL.
+    v = v.lstrip(_C0_OR_SPACE)
+    if "\t" in v or "\r" in v or "\n" in v:
+        v = v.replace("\t", "").replace("\r", "").replace("\n", "")
+    return v
+
+def _split(v: str) -> tuple[str, str, str]:
+    # SKIP_RE has already filtered out scheme and //host links, so this is all
+    # of urlparse that applies: "#fragment", "?query" and ";params" on the
+    # last path segment (dropped).
+    v = _clean(v)
+    path, _, frag = v.partition("#")
+    path, _, query = path.partition("?")
+    i = path.find(";", path.rfind("/") + 1)
+    if i >= 0:
+        path = path[:i]
+    return path, query, frag
 
 def strip_fragment_query(v: str) -> str:
-    parsed = urlparse(v)
-    return unquote(parsed.path)
+    return unquote(_split(v)[0])
 
 def preserve_suffix(original: str, new_path_only: str) -> str:
-    parsed = urlparse(original)
+    _, query, frag = _split(original)
     suffix = ""
-    if parsed.query:
-        suffix += "?" + parsed.query
-    if parsed.fragment:
-        suffix += "#" + parsed.fragment
+    if query:
+        suffix += "?" + query
+    if frag:
+        suffix += "#" + frag
     return new_path_only + suffix
 
-def build_filename_index(build_plan_root: Path) -> dict[str, list[Path]]:
-    idx: dict[str, list[Path]] = {}
-    for p in build_plan_root.rglob("*"):
-        if p.is_file():
-            idx.setdefault(p.name.lower(), []).append(p.resolve())
+def _scandir_files(path: str):
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                # Symlinked files count (as with rglob + is_file()); symlinked dirs are not entered.
+                if entry.is_file():
+                    yield entry
+                elif entry.is_dir(follow_symlinks=False):
+                    yield from _scandir_files(entry.path)
+    except PermissionError:
+        return
+
+def build_filename_index(build_plan_root: Path) -> dict[str, list[str]]:
+    # Absolute path strings, left unresolved; only the chosen candidate gets resolved.
+    idx: dict[str, list[str]] = {}
+    for entry in _scandir_files(str(build_plan_root)):
+        idx.setdefault(entry.name.lower(), []).append(entry.path)
     return idx
 
 def resolve_target(html_file: Path, link_val: str) -> Path:
     raw = strip_fragment_query(link_val)
-    return (html_file.parent / raw).resolve()
+    # Lexical normalisation is enough inside the repo; no realpath per link.
+    return Path(os.path.normpath(html_file.parent / raw))
 
-def to_rel(from_dir: Path, target: Path) -> str:
-    rel_path = os.path.relpath(str(target), start=str(from_dir))
-    return rel_path.replace("\\", "/")
+@lru_cache(maxsize=8192)
+def to_rel(from_dir: str, target: str) -> str:
+    return os.path.relpath(target, start=from_dir).replace("\\", "/")
 
-def choose_best_candidate(current_html: Path, candidates: list[Path]) -> Path:
-    cur_dir = current_html.parent.resolve()
-
-    def score(p: Path) -> tuple[int, int, str]:
-        same_dir = 1 if p.parent.resolve() == cur_dir else 0
+def choose_best_candidate(cur_dir: str, candidates: list[str]) -> str:
+    def score(c: str) -> tuple[int, int, str]:
+        same_dir = 1 if os.path.dirname(c) == cur_dir else 0
         try:
-            relp = os.path.relpath(str(p), start=str(cur_dir)).replace("\\", "/")
+            relp = os.path.relpath(c, start=cur_dir).replace("\\", "/")
             depth = relp.count("/") + 1
         except Exception:
             depth = 9999
-        return (same_dir, -depth, str(p).lower())
+        return (same_dir, -depth, c.lower())
 
     return sorted(candidates, key=score, reverse=True)[0]
 
+_CSV_SPECIAL = frozenset(',"\r\n')
+
+def _fmt(v: str) -> str:
+    # Same quoting as csv.writer's default QUOTE_MINIMAL dialect.
+    if _CSV_SPECIAL.isdisjoint(v):
+        return v
+    return '"' + v.replace('"', '""') + '"'
+
+def write_issues_csv(path: Path, issues: list[LinkIssue]) -> None:
+    with path.open("w", newline="", encoding="utf-8", buffering=1 << 20) as fh:
+        fh.write("file,attr,original,resolved_from,status,suggestion\r\n")
+        for r in issues:
+            # attr (href/src) and status (BROKEN/FIXED) never need quoting.
+            fh.write(
+                f"{_fmt(r.file)},{r.attr},{_fmt(r.original)},{_fmt(r.resolved_from)},"
+                f"{r.status},{_fmt(r.suggestion)}\r\n"
+            )
+
+def _after_word_char(data: bytes, pos: int) -> bool:
+    """True if the UTF-8 character ending just before pos is a non-ASCII word char."""
+    if pos == 0 or data[pos - 1] < 0x80:
+        return False
+    start = pos - 1
+    while start > max(0, pos - 4) and 0x80 <= data[start] < 0xC0:
+        start -= 1
+    ch = data[start:pos].decode("utf-8", "ignore")
+    return bool(ch) and _WORD_RE.match(ch[-1]) is not None
+
+def _repl(
+    m: re.Match[bytes],
+    html_file: Path,
+    filename_index: dict[str, list[str]],
+    file_rel: str,
+    dir_rel: str,
+    parent_abs: str,
+    broken: list[LinkIssue],
+    fixed: list[LinkIssue],
+) -> bytes:
+    """ATTR_RE_B.sub callback: record issues and return the (possibly fixed) attribute."""
+    if _after_word_char(m.string, m.start()):
+        return m.group(0)
+
+    attr = m.group("attr").decode("ascii")
+    val = m.group("val").decode("utf-8", "ignore")
+
+    if not val or SKIP_RE.match(_clean(val)):
+        return m.group(0)
+
+    raw_path = strip_fragment_query(val)
+    if not raw_path:
+        return m.group(0)
+
+    target = resolve_target(html_file, val)
+    if target.exists():
+        return m.group(0)
+
+    filename = Path(raw_path).name.lower()
+    candidates = filename_index.get(filename, [])
+
+    if not candidates:
+        broken.append(
+            LinkIssue(
+                file=file_rel,
+                attr=attr,
+                original=val,
+                resolved_from=dir_rel,
+                status="BROKEN",
+                suggestion="",
+            )
+        )
+        return m.group(0)
+
+    best = choose_best_candidate(parent_abs, candidates)
+    new_rel_path = to_rel(parent_abs, os.path.realpath(best))
+    new_val = preserve_suffix(val, new_rel_path)
+
+    broken.append(
+        LinkIssue(
+            file=file_rel,
+            attr=attr,
+            original=val,
+            resolved_from=dir_rel,
+            status="BROKEN",
+            suggestion=new_val,
+        )
+    )
+    fixed.append(
+        LinkIssue(
+            file=file_rel,
+            attr=attr,
+            original=val,
+            resolved_from=dir_rel,
+            status="FIXED",
+            suggestion=new_val,
+        )
+    )
+    whole, start = m.group(0), m.start(0)
+    return whole[: m.start("val") - start] + new_val.encode("utf-8") + whole[m.end("val") - start :]
+
+def process_file(
+    f: Path, repo: Path, filename_index: dict[str, list[str]], apply: bool
+) -> tuple[list[LinkIssue], list[LinkIssue]]:
+    broken: list[LinkIssue] = []
+    fixed: list[LinkIssue] = []
+
+    data = f.read_bytes()
+    repl = partial(
+        _repl,
+        html_file=f,
+        filename_index=filename_index,
+        file_rel=f.relative_to(repo).as_posix(),
+        dir_rel=f.parent.relative_to(repo).as_posix(),
+        parent_abs=str(f.parent),
+        broken=broken,
+        fixed=fixed,
+    )
+    new_data = ATTR_RE_B.sub(repl, data)
+
+    if fixed and apply:
+        bak = f.with_suffix(f.suffix + ".bak_polish")
+        if not bak.exists():
+            bak.write_bytes(data)
+        f.write_bytes(new_data)
+
+    return broken, fixed
+
+# Below this many files a process pool costs more to start (and, under Windows
+# spawn, to re-import this module in every worker) than it saves.
+PARALLEL_MIN_FILES = 500
+CHUNKSIZE = 16
+
+# Read-only filename index, sent once per worker process by _init_worker
+# instead of being pickled with every task.
+_worker_index: dict[str, list[str]] = {}
+
+def _init_worker(filename_index: dict[str, list[str]]) -> None:
+    global _worker_index
+    _worker_index = filename_index
+
+def _process_in_worker(f: Path, repo: Path, apply: bool) -> tuple[list[LinkIssue], list[LinkIssue]]:
+    return process_file(f, repo, _worker_index, apply)
+
+def process_files(
+    html_files: list[Path], repo: Path, filename_index: dict[str, list[str]], apply: bool
+):
+    """Yield (broken, fixed) per file, in html_files order."""
+    if len(html_files) < PARALLEL_MIN_FILES:
+        for f in html_files:
+            yield process_file(f, repo, filename_index, apply)
+        return
+
+    # Imported here: concurrent.futures alone costs more than a small serial run.
+    from concurrent.futures import ProcessPoolExecutor
+
+    workers = min(os.cpu_count() or 1, -(-len(html_files) // CHUNKSIZE))
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(filename_index,)
+    ) as ex:
+        work = partial(_process_in_worker, repo=repo, apply=apply)
+        yield from ex.map(work, html_files, chunksize=CHUNKSIZE)
+
 def main() -> None:
     ap = argparse.ArgumentParser()
     ap.add_argument("--root", required=True, help="Repo root path")
@@ -112,96 +306,12 @@ def main() -> None:
 
     html_files = sorted([p for p in bp.rglob("*.html") if p.is_file()])
 
-    for f in html_files:
-        text = f.read_text(encoding="utf-8", errors="ignore")
-        replacements: list[tuple[int, int, str]] = []
-
-        for m in ATTR_RE.finditer(text):
-            attr = m.group("attr")
-            val = m.group("val")
-
-            if not val or is_external(val):
-                continue
-
-            # ignore absolute disk paths like C:\...
-            if re.match(r"^[A-Za-z]:[\\/]", val):
-                continue
-
-            # ignore data URIs
-            if val.lower().startswith("data:"):
-                continue
-
-            raw_path = strip_fragment_query(val)
-            if not raw_path:
-                continue
-
-            target = resolve_target(f, val)
-            if target.exists():
-                continue
-
-            filename = Path(raw_path).name.lower()
-            candidates = filename_index.get(filename, [])
-
-            if not candidates:
-                broken.append(
-                    LinkIssue(
-                        file=f.relative_to(repo).as_posix(),
-                        attr=attr,
-                        original=val,
-                        resolved_from=f.parent.relative_to(repo).as_posix(),
-                        status="BROKEN",
-                        suggestion="",
-                    )
-                )
-                continue
-
-            best = choose_best_candidate(f, candidates)
-            new_rel_path = to_rel(f.parent.resolve(), best.resolve())
-            new_val = preserve_suffix(val, new_rel_path)
-
-            broken.append(
-                LinkIssue(
-                    file=f.relative_to(repo).as_posix(),
-                    attr=attr,
-                    original=val,
-                    resolved_from=f.parent.relative_to(repo).as_posix(),
-                    status="BROKEN",
-                    suggestion=new_val,
-                )
-            )
-            fixed.append(
-                LinkIssue(
-                    file=f.relative_to(repo).as_posix(),
-                    attr=attr,
-                    original=val,
-                    resolved_from=f.parent.relative_to(repo).as_posix(),
-                    status="FIXED",
-                    suggestion=new_val,
-                )
-            )
-            replacements.append((m.start("val"), m.end("val"), new_val))
-
-        if replacements and args.apply:
-            bak = f.with_suffix(f.suffix + ".bak_polish")
-            if not bak.exists():
-                bak.write_text(text, encoding="utf-8", errors="ignore")
-
-            new_text = text
-            for start, end, new_val in sorted(replacements, key=lambda x: x[0], reverse=True):
-                new_text = new_text[:start] + new_val + new_text[end:]
-            f.write_text(new_text, encoding="utf-8", errors="ignore")
-
-    with broken_csv.open("w", newline="", encoding="utf-8") as fh:
-        w = csv.writer(fh)
-        w.writerow(["file", "attr", "original", "resolved_from", "status", "suggestion"])
-        for r in broken:
-            w.writerow([r.file, r.attr, r.original, r.resolved_from, r.status, r.suggestion])
-
-    with fixed_csv.open("w", newline="", encoding="utf-8") as fh:
-        w = csv.writer(fh)
-        w.writerow(["file", "attr", "original", "resolved_from", "status", "suggestion"])
-        for r in fixed:
-            w.writerow([r.file, r.attr, r.original, r.resolved_from, r.status, r.suggestion])
+    for file_broken, file_fixed in process_files(html_files, repo, filename_index, args.apply):
+        broken.extend(file_broken)
+        fixed.extend(file_fixed)
+
+    write_issues_csv(broken_csv, broken)
+    write_issues_csv(fixed_csv, fixed)
 
     print(f"\nScanned HTML files: {len(html_files)}")
     print(f"Broken links found: {len(broken)}")
@@ -10,6 +10,26 @@ TARGET_SRC = APP / "src"
 STAMP = datetime.now().strftime("%Y%m%d_%H%M%S")
 BACKUP_DIR = APP / "archive" / "_restore_backups" / f"src_backup_{STAMP}"
 
+FICLONE = 0x40049409  # linux/fs.h: _IOW(0x94, 9, int)
+
+
+def clone_or_copy(src, dst):
+    """
+    copytree copy_function: CoW reflink clone where the filesystem supports
+    it (btrfs, XFS), full copy2 otherwise. Hard links are not used because the
+    backup must not change when the restored files are edited in place.
+    """
+    try:
+        import fcntl
+
+        with open(src, "rb") as fs, open(dst, "wb") as fd:
+            fcntl.ioctl(fd.fileno(), FICLONE, fs.fileno())
+        shutil.copystat(src, dst)
+        return dst
+    except (ImportError, OSError):
+        return shutil.copy2(src, dst)
+
+
 print("=== RESTORE APP SRC ===")
 print(f"Legacy src:  {LEGACY_SRC}")
 print(f"Target src:  {TARGET_SRC}")
@@ -25,7 +45,7 @@ if TARGET_SRC.exists():
 # 1) Backup (copy) legacy src first
 BACKUP_DIR.parent.mkdir(parents=True, exist_ok=True)
 print("1) Creating backup copy of legacy src...")
-shutil.copytree(LEGACY_SRC, BACKUP_DIR)
+shutil.copytree(LEGACY_SRC, BACKUP_DIR, copy_function=clone_or_copy)
 print("   ✅ Backup created.")
 
 # 2) Move legacy src back into place as writers-dashboard-app/src